@@ -1,228 +1,595 @@
-import os
-from datetime import datetime
-from colorama import Fore, Style, init
-import openai
-import json
-from typing import Any, Dict, List, Optional
-
-# Initialize colorama for colored output
-init()
-
-# Initialize OpenAI client
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
-def jira_jql_search(jql: str, fields: List[str]) -> Dict[str, Any]:
-    """Wrapper for MCP JQL search function."""
-    try:
-        response = mcp_jira_mcp_jql_search(jql=jql, fields=fields)
-        if isinstance(response, str):
-            return json.loads(response)
-        return response
-    except Exception as e:
-        print(f"{Fore.RED}Error in JQL search: {str(e)}{Style.RESET_ALL}")
-        return {"issues": []}
-
-def jira_get_issue(issue_key: str, fields: List[str]) -> Dict[str, Any]:
-    """Wrapper for MCP get issue function."""
-    try:
-        response = mcp_jira_mcp_get_issue(issueIdOrKey=issue_key, fields=fields)
-        if isinstance(response, str):
-            return json.loads(response)
-        return response
-    except Exception as e:
-        print(f"{Fore.RED}Error getting issue: {str(e)}{Style.RESET_ALL}")
-        return None
-
-class JiraChatbot:
-    def __init__(self):
-        self.conversation_history = []
-        
-    def _get_ai_response(self, prompt: str, system_prompt: str = "You are a helpful Jira assistant.") -> str:
-        """Get AI response using OpenAI."""
-        try:
-            messages = [
-                {"role": "system", "content": system_prompt},
-                *self.conversation_history[-5:],  # Keep last 5 messages for context
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=150
-            )
-            
-            ai_response = response.choices[0].message.content
-            self.conversation_history.append({"role": "user", "content": prompt})
-            self.conversation_history.append({"role": "assistant", "content": ai_response})
-            return ai_response
-        except Exception as e:
-            return str(e)
-
-    def _generate_jql_from_natural_language(self, query: str) -> str:
-        """Convert natural language query to JQL using AI."""
-        system_prompt = """
-        You are a Jira query expert. Convert natural language queries to JQL (Jira Query Language).
-        Only respond with the JQL query, nothing else.
-        Examples:
-        Input: "show me all high priority bugs assigned to me"
-        Output: assignee = currentUser() AND priority = High AND type = Bug ORDER BY created DESC
-        Input: "what are my open tasks"
-        Output: assignee = currentUser() AND status = "Open" ORDER BY created DESC
-        Input: "show my latest issues"
-        Output: assignee = currentUser() ORDER BY created DESC
-        Input: "find issues created today"
-        Output: assignee = currentUser() AND created >= startOfDay() ORDER BY created DESC
-        """
-        
-        try:
-            response = self._get_ai_response(query, system_prompt)
-            return response.strip()
-        except Exception as e:
-            print(f"{Fore.RED}Error generating JQL: {str(e)}{Style.RESET_ALL}")
-            return "assignee = currentUser() ORDER BY created DESC"  # fallback query
-
-    def _format_date(self, date_str: str) -> str:
-        """Format date string to a more readable format."""
-        try:
-            dt = datetime.strptime(date_str[:19], '%Y-%m-%dT%H:%M:%S')
-            return dt.strftime('%Y-%m-%d %H:%M:%S')
-        except Exception:
-            return date_str
-
-    def _format_issue_display(self, issue: Dict[str, Any], include_description: bool = True) -> str:
-        """Format a single issue for display."""
-        result = []
-        result.append(f"\n{Fore.CYAN}Issue Key:{Style.RESET_ALL} {issue['key']}")
-        result.append(f"{Fore.CYAN}Summary:{Style.RESET_ALL} {issue['fields']['summary']}")
-        result.append(f"{Fore.CYAN}Status:{Style.RESET_ALL} {issue['fields']['status']['name']}")
-        result.append(f"{Fore.CYAN}Priority:{Style.RESET_ALL} {issue['fields']['priority']['name']}")
-        result.append(f"{Fore.CYAN}Created:{Style.RESET_ALL} {self._format_date(issue['fields']['created'])}")
-        result.append(f"{Fore.CYAN}Updated:{Style.RESET_ALL} {self._format_date(issue['fields']['updated'])}")
-        
-        if include_description and issue['fields'].get('description'):
-            result.append(f"{Fore.CYAN}Description:{Style.RESET_ALL} {issue['fields']['description']}")
-        
-        return "\n".join(result)
-
-    def get_my_issues(self, natural_query: Optional[str] = None) -> str:
-        """Fetch issues assigned to the current user."""
-        try:
-            # Generate JQL from natural language if provided
-            if natural_query:
-                jql = self._generate_jql_from_natural_language(natural_query)
-                print(f"{Fore.YELLOW}Generated JQL:{Style.RESET_ALL} {jql}")
-            else:
-                jql = "assignee = currentUser() ORDER BY created DESC"
-
-            # Make the tool call
-            response = jira_jql_search(
-                jql=jql,
-                fields=["summary", "status", "priority", "created", "updated", "description"]
-            )
-            
-            if not response or not response.get("issues"):
-                return f"{Fore.YELLOW}No issues found matching your query.{Style.RESET_ALL}"
-            
-            issues = response.get("issues", [])
-            total = response.get("total", len(issues))
-            
-            result = [f"{Fore.GREEN}Found {total} issue(s):{Style.RESET_ALL}"]
-            
-            for issue in issues:
-                result.append(self._format_issue_display(issue, include_description=False))
-                result.append("-" * 50)
-            
-            return "\n".join(result)
-            
-        except Exception as e:
-            return f"{Fore.RED}Error fetching issues: {str(e)}{Style.RESET_ALL}"
-
-    def get_issue_details(self, issue_key: str) -> str:
-        """Get detailed information about a specific issue."""
-        try:
-            # Make the tool call
-            response = jira_get_issue(
-                issue_key=issue_key,
-                fields=["summary", "status", "priority", "description", "created", "updated"]
-            )
-            
-            if not response:
-                return f"{Fore.RED}Issue {issue_key} not found.{Style.RESET_ALL}"
-            
-            result = [f"{Fore.GREEN}Details for issue {issue_key}:{Style.RESET_ALL}"]
-            result.append(self._format_issue_display(response, include_description=True))
-            return "\n".join(result)
-            
-        except Exception as e:
-            return f"{Fore.RED}Error fetching issue details: {str(e)}{Style.RESET_ALL}"
-
-    def process_command(self, command: str) -> str:
-        """Process user commands."""
-        command = command.lower().strip()
-        
-        if command in ['my issues', 'show my issues', 'list issues']:
-            return self.get_my_issues()
-        elif command.startswith('details '):
-            issue_key = command.split('details ')[1].strip().upper()
-            return self.get_issue_details(issue_key)
-        elif command in ['help', '?']:
-            return self._get_help()
-        elif command in ['exit', 'quit', 'bye']:
-            return 'exit'
-        else:
-            # Try to interpret the command as a natural language query
-            return self.get_my_issues(command)
-
-    def _get_help(self) -> str:
-        """Return help information."""
-        help_text = [
-            f"\n{Fore.GREEN}Available commands:{Style.RESET_ALL}",
-            "1. Basic commands:",
-            "   - my issues: Show all issues assigned to you",
-            "   - details [ISSUE-KEY]: Show detailed information about a specific issue",
-            "   - help: Show this help message",
-            "   - exit: Exit the chatbot",
-            "",
-            "2. Natural language queries (examples):",
-            "   - show me my high priority tasks",
-            "   - what issues are in To Do status",
-            "   - show my latest created issues",
-            "   - find issues created today",
-            "",
-            f"{Fore.YELLOW}Tip: You can ask about your issues in plain English!{Style.RESET_ALL}"
-        ]
-        return "\n".join(help_text)
-
-def main():
-    print(f"{Fore.CYAN}Initializing Jira Chatbot with AI capabilities...{Style.RESET_ALL}")
-    chatbot = JiraChatbot()
-    
-    print(f"\n{Fore.GREEN}Welcome to AI-powered Jira Chatbot!{Style.RESET_ALL}")
-    print("Type 'help' for available commands or 'exit' to quit.")
-    print(f"{Fore.YELLOW}You can use natural language to query your issues!{Style.RESET_ALL}")
-    
-    while True:
-        try:
-            user_input = input(f"\n{Fore.YELLOW}You:{Style.RESET_ALL} ").strip()
-            
-            if not user_input:
-                continue
-                
-            response = chatbot.process_command(user_input)
-            
-            if response == 'exit':
-                print(f"\n{Fore.GREEN}Goodbye!{Style.RESET_ALL}")
-                break
-                
-            print(f"\n{Fore.MAGENTA}Bot:{Style.RESET_ALL} {response}")
-            
-        except KeyboardInterrupt:
-            print(f"\n{Fore.GREEN}Goodbye!{Style.RESET_ALL}")
-            break
-        except Exception as e:
-            print(f"\n{Fore.RED}An error occurred: {str(e)}{Style.RESET_ALL}")
-
-if __name__ == "__main__":
-    main() 
\ No newline at end of file
+import asyncio
+import functools
+import hashlib
+import os
+import re
+import shelve
+import string
+import sys
+import uuid
+from datetime import datetime
+from colorama import Fore, Style, init
+from openai import AsyncOpenAI
+import orjson
+import json
+from typing import Any, AsyncIterator, Dict, Final, List, Optional, Union
+
+try:
+    import tiktoken
+    _TOKEN_ENCODER = tiktoken.encoding_for_model("gpt-3.5-turbo")
+except Exception:
+    _TOKEN_ENCODER = None
+
+# Initialize colorama for colored output
+init()
+
+# Without a key every AI call is a guaranteed-failing round trip, so natural
+# language queries fall back to the rule-based translator below
+_HAS_AI = bool(os.getenv("OPENAI_API_KEY"))
+
+# Keyword -> JQL clause rules for the offline fallback translator
+_KEYWORD_JQL_RULES = [
+    ('high priority', 'priority = High'),
+    ('low priority', 'priority = Low'),
+    ('bug', 'type = Bug'),
+    ('task', 'type = Task'),
+    ('to do', 'status = "To Do"'),
+    ('in progress', 'status = "In Progress"'),
+    ('open', 'status = "Open"'),
+    ('done', 'status = Done'),
+    ('today', 'created >= startOfDay()'),
+    ('this week', 'created >= startOfWeek()'),
+]
+
+def _keyword_jql(normalized_query: str) -> str:
+    """Translate a normalized query to JQL with keyword rules (no AI needed)."""
+    clauses = ['assignee = currentUser()']
+    for keyword, clause in _KEYWORD_JQL_RULES:
+        if keyword in normalized_query:
+            clauses.append(clause)
+    return ' AND '.join(clauses) + ' ORDER BY created DESC'
+
+# Retry/timeout policy for the shared OpenAI client
+_OPENAI_MAX_RETRIES = 3
+_OPENAI_TIMEOUT = 20.0  # seconds
+
+def _create_openai_client() -> AsyncOpenAI:
+    """Build the shared OpenAI client.
+
+    The v1 client pools connections over httpx, so TLS/TCP handshakes are
+    paid once, and transient 429/5xx responses are retried with exponential
+    backoff built in. The caller owns the client and must close it on
+    shutdown.
+    """
+    return AsyncOpenAI(max_retries=_OPENAI_MAX_RETRIES, timeout=_OPENAI_TIMEOUT)
+
+# On-disk cache of natural language -> JQL translations (survives restarts)
+_JQL_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".jql_cache")
+_JQL_CACHE_MAXSIZE = 512
+
+# History token budget; history is only trimmed when it exceeds this, so the
+# message prefix stays stable across turns and provider prompt caching can hit
+MAX_HISTORY_TOKENS = 2048
+
+def _count_tokens(text: str) -> int:
+    """Count the model tokens in a string.
+
+    Falls back to a ~4-characters-per-token estimate when tiktoken is not
+    installed.
+    """
+    if _TOKEN_ENCODER is not None:
+        return len(_TOKEN_ENCODER.encode(text))
+    return len(text) // 4
+
+# Few-shot prompt for the JQL translator; module-level so it is built once and
+# presents a stable prefix to the provider's prompt cache
+JQL_SYSTEM_PROMPT: Final[str] = """
+You are a Jira query expert. Convert natural language queries to JQL (Jira Query Language).
+Only respond with the JQL query, nothing else.
+Examples:
+Input: "show me all high priority bugs assigned to me"
+Output: assignee = currentUser() AND priority = High AND type = Bug ORDER BY created DESC
+Input: "what are my open tasks"
+Output: assignee = currentUser() AND status = "Open" ORDER BY created DESC
+Input: "show my latest issues"
+Output: assignee = currentUser() ORDER BY created DESC
+Input: "find issues created today"
+Output: assignee = currentUser() AND created >= startOfDay() ORDER BY created DESC
+"""
+
+@functools.lru_cache(maxsize=None)
+def _prompt_cache_key_for(system_prompt: str) -> str:
+    """Stable cache-routing key for stateless calls sharing a system prompt.
+
+    Hashing the prompt (rather than using the per-session UUID) lets the
+    provider reuse cached KV state for the few-shot prefix across sessions.
+    """
+    return "jira-chatbot-" + hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+# Extra instruction prepended when several queries are coalesced into one call
+JQL_BATCH_INSTRUCTION = (
+    "Translate each numbered line to JQL. Respond with a JSON array of JQL "
+    "strings, one per line, in order, and nothing else."
+)
+
+# How long to wait for more queries to join a translation batch
+_JQL_BATCH_WINDOW = 0.05  # seconds
+
+# Fields requested when showing full issue details
+_ISSUE_DETAIL_FIELDS = ["summary", "status", "priority", "description", "created", "updated"]
+
+# Cap on concurrent Jira fetches so a long key list doesn't flood the server
+_MAX_CONCURRENT_FETCHES = 10
+
+# Issues requested per JQL search page; well above Jira's default of 50
+_SEARCH_BATCH_SIZE = 500
+
+# Parameterized command: "details KEY [KEY ...]" (input is lowercased first)
+_DETAILS_RE = re.compile(r'^details((?:\s+[a-z0-9-]+)+)$')
+
+# Shape of a valid Jira issue key, e.g. PROJ-123
+_ISSUE_KEY_RE = re.compile(r'^[A-Z][A-Z0-9]+-\d+$')
+
+# Issue display templates, built once at import. Whether stdout is a terminal
+# is checked once; piped or redirected output gets the plain template so it
+# carries no escape codes at all.
+def _build_issue_template(colored: bool) -> string.Template:
+    def label(text: str) -> str:
+        return f"{Fore.CYAN}{text}{Style.RESET_ALL}" if colored else text
+    return string.Template("\n".join((
+        "\n%s $key" % label("Issue Key:"),
+        "%s $summary" % label("Summary:"),
+        "%s $status" % label("Status:"),
+        "%s $priority" % label("Priority:"),
+        "%s $created" % label("Created:"),
+        "%s $updated" % label("Updated:"),
+    )))
+
+_TPL_COLOR = _build_issue_template(True)
+_TPL_PLAIN = _build_issue_template(False)
+_COLOR = sys.stdout.isatty()
+_ISSUE_TPL = _TPL_COLOR if _COLOR else _TPL_PLAIN
+_LBL_DESCRIPTION = f"{Fore.CYAN}Description:{Style.RESET_ALL}" if _COLOR else "Description:"
+
+@functools.lru_cache(maxsize=4096)
+def _format_date(date_str: str) -> str:
+    """Format date string to a more readable format.
+
+    Cached because many issues in a result set share created/updated stamps.
+    """
+    try:
+        # Jira timestamps are ISO 8601, so the common case is a pure slice --
+        # no datetime object needed at all
+        if len(date_str) >= 19 and date_str[10] == 'T':
+            return date_str[:10] + ' ' + date_str[11:19]
+        dt = datetime.fromisoformat(date_str[:19])
+        return dt.strftime('%Y-%m-%d %H:%M:%S')
+    except Exception:
+        return date_str
+
+def _normalize_query(query: str) -> str:
+    """Normalize a natural language query so near-identical prompts share a cache key."""
+    return re.sub(r'\s+', ' ', query.lower().strip())
+
+def _jql_cache_key(normalized_query: str) -> str:
+    return hashlib.sha1(normalized_query.encode("utf-8")).hexdigest()
+
+def _jql_cache_load(normalized_query: str) -> Optional[str]:
+    """Look up a cached translation on disk; cache problems are never fatal."""
+    try:
+        with shelve.open(_JQL_CACHE_PATH) as cache:
+            return cache.get(_jql_cache_key(normalized_query))
+    except Exception:
+        return None
+
+def _jql_cache_store(normalized_query: str, jql: str) -> None:
+    """Persist a translation on disk; cache problems are never fatal."""
+    try:
+        with shelve.open(_JQL_CACHE_PATH) as cache:
+            cache[_jql_cache_key(normalized_query)] = jql
+    except Exception:
+        pass
+
+def jira_jql_search(jql: str, fields: List[str], max_results: int = 50, start_at: int = 0) -> Dict[str, Any]:
+    """Wrapper for MCP JQL search function."""
+    try:
+        response = mcp_jira_mcp_jql_search(jql=jql, fields=fields, maxResults=max_results, startAt=start_at)
+        if isinstance(response, str):
+            return orjson.loads(response)
+        return response
+    except Exception as e:
+        print(f"{Fore.RED}Error in JQL search: {str(e)}{Style.RESET_ALL}")
+        return {"issues": []}
+
+def jira_get_issue(issue_key: str, fields: List[str]) -> Dict[str, Any]:
+    """Wrapper for MCP get issue function."""
+    try:
+        response = mcp_jira_mcp_get_issue(issueIdOrKey=issue_key, fields=fields)
+        if isinstance(response, str):
+            return orjson.loads(response)
+        return response
+    except Exception as e:
+        print(f"{Fore.RED}Error getting issue: {str(e)}{Style.RESET_ALL}")
+        return None
+
+class JiraChatbot:
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        self._client = client
+        self.conversation_history = []
+        self._history_tokens = []  # token count per history message, kept in lockstep
+        self._jql_cache = {}  # normalized query -> JQL, hot layer over the disk cache
+        # Stable per-session key so the provider can route calls to cached KV state
+        self._prompt_cache_key = f"jira-chatbot-{uuid.uuid4().hex}"
+        # Micro-batching of JQL translations; queue and worker start lazily so
+        # they bind to the running event loop
+        self._jql_queue: Optional[asyncio.Queue] = None
+        self._jql_batcher: Optional[asyncio.Task] = None
+        self._fetch_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FETCHES)
+
+    async def aclose(self) -> None:
+        """Stop the background translation batcher."""
+        if self._jql_batcher is not None:
+            self._jql_batcher.cancel()
+            try:
+                await self._jql_batcher
+            except asyncio.CancelledError:
+                pass
+            self._jql_batcher = None
+
+    async def _translate_jql(self, query: str) -> str:
+        """Queue a query for translation and wait for its result.
+
+        Queries arriving within the batch window share one OpenAI call.
+        """
+        if self._jql_queue is None:
+            self._jql_queue = asyncio.Queue()
+            self._jql_batcher = asyncio.create_task(self._jql_batch_worker())
+        future = asyncio.get_running_loop().create_future()
+        self._jql_queue.put_nowait((query, future))
+        return await future
+
+    async def _jql_batch_worker(self) -> None:
+        """Coalesce queued translation requests into single OpenAI calls.
+
+        API failures propagate from _get_ai_response and are set on every
+        waiting future, so callers fall back to the default JQL.
+        """
+        while True:
+            batch = [await self._jql_queue.get()]
+            # Debounce: pick up any queries that arrive within the window
+            try:
+                while True:
+                    batch.append(await asyncio.wait_for(self._jql_queue.get(), _JQL_BATCH_WINDOW))
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                if len(batch) == 1:
+                    response = await self._get_ai_response(batch[0][0], JQL_SYSTEM_PROMPT,
+                                                           record_history=False)
+                    jqls = [response]
+                else:
+                    lines = "\n".join(f"{i}. {query}" for i, (query, _) in enumerate(batch, 1))
+                    response = await self._get_ai_response(f"{JQL_BATCH_INSTRUCTION}\n{lines}",
+                                                           JQL_SYSTEM_PROMPT, record_history=False)
+                    jqls = json.loads(response.strip())
+                    if (not isinstance(jqls, list) or len(jqls) != len(batch)
+                            or not all(isinstance(jql, str) for jql in jqls)):
+                        raise ValueError("batched translation did not return one JQL string per query")
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), jql in zip(batch, jqls):
+                if not future.done():
+                    future.set_result(str(jql).strip())
+
+    def _trim_history(self) -> None:
+        """Drop the oldest turns only when the history exceeds the token budget.
+
+        Token counts are tracked per message, so trimming only sums the
+        running tally. Whole user/assistant pairs are removed from the front
+        so the remaining prefix stays aligned with message boundaries.
+        """
+        total = sum(self._history_tokens)
+        while len(self.conversation_history) > 2 and total > MAX_HISTORY_TOKENS:
+            total -= self._history_tokens[0] + self._history_tokens[1]
+            del self.conversation_history[:2]
+            del self._history_tokens[:2]
+
+    async def _get_ai_response(self, prompt: str, system_prompt: str = "You are a helpful Jira assistant.",
+                               record_history: bool = True, echo: bool = False) -> str:
+        """Get AI response using OpenAI.
+
+        With record_history=False the call is stateless: it neither sends nor
+        appends to the conversation history (used for the JQL translator),
+        and API failures are raised rather than returned as text.
+
+        The response is always streamed so decoding overlaps the network; with
+        echo=True tokens are also printed as they arrive, so the user sees
+        output at first-token time rather than after the full response.
+        """
+        try:
+            self._trim_history()
+            # System prompt + append-only history form a stable prefix; only the
+            # final user message changes between calls, so prompt caching can hit
+            messages = [
+                {"role": "system", "content": system_prompt},
+                *(self.conversation_history if record_history else []),
+                {"role": "user", "content": prompt}
+            ]
+
+            if self._client is None:
+                raise RuntimeError("No OpenAI client configured (OPENAI_API_KEY unset)")
+
+            response = await self._client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=150,
+                prompt_cache_key=(self._prompt_cache_key if record_history
+                                  else _prompt_cache_key_for(system_prompt)),
+                stream=True
+            )
+
+            parts = []
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    if echo:
+                        sys.stdout.write(delta)
+                        sys.stdout.flush()
+            if echo and parts:
+                sys.stdout.write("\n")
+                sys.stdout.flush()
+            ai_response = "".join(parts)
+            if record_history:
+                self.conversation_history.append({"role": "user", "content": prompt})
+                self.conversation_history.append({"role": "assistant", "content": ai_response})
+                self._history_tokens.append(_count_tokens(prompt))
+                self._history_tokens.append(_count_tokens(ai_response))
+            return ai_response
+        except Exception as e:
+            if not record_history:
+                # Stateless callers (the JQL translator) must see the failure;
+                # returning the error text here would let it be cached as JQL
+                raise
+            return str(e)
+
+    async def _generate_jql_from_natural_language(self, query: str) -> str:
+        """Convert natural language query to JQL using AI."""
+        normalized = _normalize_query(query)
+
+        # Repeat queries map to the same JQL, so serve them without an API call
+        cached = self._jql_cache.get(normalized)
+        if cached is None:
+            cached = _jql_cache_load(normalized)
+        if cached is not None:
+            self._jql_cache[normalized] = cached
+            return cached
+
+        # No API key: answer locally instead of paying a failing round trip
+        if not _HAS_AI:
+            return _keyword_jql(normalized)
+
+        try:
+            response = await self._translate_jql(query)
+            jql = response.strip()
+            if len(self._jql_cache) >= _JQL_CACHE_MAXSIZE:
+                self._jql_cache.pop(next(iter(self._jql_cache)))  # evict oldest entry
+            self._jql_cache[normalized] = jql
+            _jql_cache_store(normalized, jql)
+            return jql
+        except Exception as e:
+            print(f"{Fore.RED}Error generating JQL: {str(e)}{Style.RESET_ALL}")
+            return "assignee = currentUser() ORDER BY created DESC"  # fallback query
+
+    def _format_issue_display(self, issue: Dict[str, Any], include_description: bool = True) -> str:
+        """Format a single issue for display."""
+        fields = issue['fields']
+        result = _ISSUE_TPL.substitute(
+            key=issue['key'],
+            summary=fields['summary'],
+            status=fields['status']['name'],
+            priority=fields['priority']['name'],
+            created=_format_date(fields['created']),
+            updated=_format_date(fields['updated']),
+        )
+
+        if include_description and fields.get('description'):
+            result += "\n%s %s" % (_LBL_DESCRIPTION, fields['description'])
+
+        return result
+
+    async def get_my_issues(self, natural_query: Optional[str] = None) -> AsyncIterator[str]:
+        """Fetch issues assigned to the current user, yielding them page by page.
+
+        Results are streamed so only one search page is held in memory at a
+        time, regardless of how many issues the query matches.
+        """
+        try:
+            # Generate JQL from natural language if provided
+            if natural_query:
+                jql = await self._generate_jql_from_natural_language(natural_query)
+                yield f"{Fore.YELLOW}Generated JQL:{Style.RESET_ALL} {jql}"
+            else:
+                jql = "assignee = currentUser() ORDER BY created DESC"
+
+            start_at = 0
+            total = None
+            warned = False
+            while True:
+                response = await asyncio.to_thread(
+                    jira_jql_search, jql,
+                    ["summary", "status", "priority", "created", "updated", "description"],
+                    _SEARCH_BATCH_SIZE, start_at
+                )
+                issues = response.get("issues", []) if response else []
+
+                if start_at == 0:
+                    if not issues:
+                        yield f"{Fore.YELLOW}No issues found matching your query.{Style.RESET_ALL}"
+                        return
+                    total = response.get("total", len(issues))
+                    yield f"{Fore.GREEN}Found {total} issue(s):{Style.RESET_ALL}"
+                elif not issues:
+                    return
+
+                if not warned and len(issues) < _SEARCH_BATCH_SIZE and start_at + len(issues) < total:
+                    yield (f"{Fore.YELLOW}Server capped the page at {len(issues)} issues "
+                           f"(requested {_SEARCH_BATCH_SIZE}); paging through the rest.{Style.RESET_ALL}")
+                    warned = True
+
+                for issue in issues:
+                    yield self._format_issue_display(issue, include_description=False)
+                    yield "-" * 50
+
+                start_at += len(issues)
+                if start_at >= total:
+                    return
+
+        except Exception as e:
+            yield f"{Fore.RED}Error fetching issues: {str(e)}{Style.RESET_ALL}"
+
+    async def _fetch_issue(self, issue_key: str) -> Optional[Dict[str, Any]]:
+        """Fetch one issue off the event loop, bounded by the fetch semaphore."""
+        async with self._fetch_semaphore:
+            return await asyncio.to_thread(jira_get_issue, issue_key, _ISSUE_DETAIL_FIELDS)
+
+    async def get_issue_details(self, *issue_keys: str) -> str:
+        """Get detailed information about one or more issues, fetched concurrently.
+
+        Keys that don't look like Jira issue keys are rejected locally instead
+        of wasting a round trip on a guaranteed 404 (and never reach the MCP
+        layer at all).
+        """
+        try:
+            valid_keys = [key for key in issue_keys if _ISSUE_KEY_RE.match(key)]
+            responses = dict(zip(valid_keys, await asyncio.gather(
+                *(self._fetch_issue(key) for key in valid_keys))))
+
+            result = []
+            for issue_key in issue_keys:
+                response = responses.get(issue_key)
+                if not _ISSUE_KEY_RE.match(issue_key):
+                    result.append(f"{Fore.RED}'{issue_key}' is not a valid issue key "
+                                  f"(expected something like PROJ-123).{Style.RESET_ALL}")
+                    continue
+                if not response:
+                    result.append(f"{Fore.RED}Issue {issue_key} not found.{Style.RESET_ALL}")
+                    continue
+                result.append(f"{Fore.GREEN}Details for issue {issue_key}:{Style.RESET_ALL}")
+                result.append(self._format_issue_display(response, include_description=True))
+            return "\n".join(result)
+
+        except Exception as e:
+            return f"{Fore.RED}Error fetching issue details: {str(e)}{Style.RESET_ALL}"
+
+    async def process_command(self, command: str) -> Union[str, AsyncIterator[str]]:
+        """Process user commands.
+
+        Returns either a complete response string or an async iterator of
+        chunks the REPL prints as they arrive.
+        """
+        command = command.lower().strip()
+
+        handler = _COMMANDS.get(command)
+        if handler is not None:
+            return handler(self)
+
+        match = _DETAILS_RE.match(command)
+        if match:
+            issue_keys = [key.upper() for key in match.group(1).split()]
+            return await self.get_issue_details(*issue_keys)
+
+        # Try to interpret the command as a natural language query
+        return self.get_my_issues(command)
+
+    def _get_help(self) -> str:
+        """Return help information."""
+        help_text = [
+            f"\n{Fore.GREEN}Available commands:{Style.RESET_ALL}",
+            "1. Basic commands:",
+            "   - my issues: Show all issues assigned to you",
+            "   - details [ISSUE-KEY ...]: Show detailed information about one or more issues",
+            "   - help: Show this help message",
+            "   - exit: Exit the chatbot",
+            "",
+            "2. Natural language queries (examples):",
+            "   - show me my high priority tasks",
+            "   - what issues are in To Do status",
+            "   - show my latest created issues",
+            "   - find issues created today",
+            "",
+            f"{Fore.YELLOW}Tip: You can ask about your issues in plain English!{Style.RESET_ALL}"
+        ]
+        return "\n".join(help_text)
+
+# Fixed commands dispatch through one dict lookup instead of an if/elif chain
+_COMMANDS = {
+    'my issues': JiraChatbot.get_my_issues,
+    'show my issues': JiraChatbot.get_my_issues,
+    'list issues': JiraChatbot.get_my_issues,
+    'help': JiraChatbot._get_help,
+    '?': JiraChatbot._get_help,
+    'exit': lambda self: 'exit',
+    'quit': lambda self: 'exit',
+    'bye': lambda self: 'exit',
+}
+
+async def main():
+    # One write for the whole banner instead of a flushing print per line
+    sys.stdout.write("\n".join([
+        f"{Fore.CYAN}Initializing Jira Chatbot with AI capabilities...{Style.RESET_ALL}",
+        "",
+        f"{Fore.GREEN}Welcome to AI-powered Jira Chatbot!{Style.RESET_ALL}",
+        "Type 'help' for available commands or 'exit' to quit.",
+        f"{Fore.YELLOW}You can use natural language to query your issues!{Style.RESET_ALL}",
+    ]) + "\n")
+    sys.stdout.flush()
+
+    # Share one pooled client (connection reuse, built-in retries) across calls
+    client = _create_openai_client() if _HAS_AI else None
+
+    chatbot = JiraChatbot(client)
+    loop = asyncio.get_running_loop()
+
+    try:
+        while True:
+            try:
+                user_input = await loop.run_in_executor(
+                    None, input, f"\n{Fore.YELLOW}You:{Style.RESET_ALL} "
+                )
+                user_input = user_input.strip()
+
+                if not user_input:
+                    continue
+
+                response = await chatbot.process_command(user_input)
+
+                if isinstance(response, str):
+                    if response == 'exit':
+                        print(f"\n{Fore.GREEN}Goodbye!{Style.RESET_ALL}")
+                        break
+                    print(f"\n{Fore.MAGENTA}Bot:{Style.RESET_ALL} {response}")
+                else:
+                    # Streamed response: print each chunk as it arrives
+                    print(f"\n{Fore.MAGENTA}Bot:{Style.RESET_ALL}")
+                    async for chunk in response:
+                        print(chunk)
+
+            except (KeyboardInterrupt, EOFError):
+                print(f"\n{Fore.GREEN}Goodbye!{Style.RESET_ALL}")
+                break
+            except Exception as e:
+                print(f"\n{Fore.RED}An error occurred: {str(e)}{Style.RESET_ALL}")
+    finally:
+        await chatbot.aclose()
+        if client is not None:
+            await client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())